@@ -7,11 +7,13 @@ necessary for implementing the breadth-first tree search that solves the basic m
 pathfinding problem.
 '''
 
-from queue import Queue
+from functools import lru_cache
 from maze_problem import *
 from dataclasses import *
 
-@dataclass
+# slots=True drops the per-instance __dict__, shrinking each node and speeding
+# up the attribute accesses that dominate BFS's inner loop
+@dataclass(slots=True)
 class SearchTreeNode:
     """
     SearchTreeNodes contain the following attributes to be used in generation of
@@ -32,6 +34,18 @@ class SearchTreeNode:
     def __str__(self) -> str:
         return "@: " + str(self.player_loc)
 
+def _pack_loc(loc: tuple[int, int]) -> int:
+    '''
+    packs a (col, row) location tuple into a single int that hashes and compares in
+    one op; MazeProblem doesn't expose the maze width, so a fixed 16-bit shift is
+    used in place of row * width + col
+    '''
+    return (loc[0] << 16) | loc[1]
+
+# movement inverses used to replay the backward search's steps in the forward
+# direction when the two searches meet (the grid's moves are all symmetric)
+_OPPOSITE_MOVES: dict[str, str] = {"U": "D", "D": "U", "L": "R", "R": "L"}
+
 def pathfind(problem: MazeProblem) -> Optional[list[str]]:
     """
     The main workhorse method of the package that performs Breadth-first search to find the optimal
@@ -50,47 +64,88 @@ def pathfind(problem: MazeProblem) -> Optional[list[str]]:
             possible, returns None.
     """
 
-    frontier: Queue[SearchTreeNode] = Queue()
     initial_state_loc: tuple[int, int] = problem.get_initial_loc()
     goal_state_loc: tuple[int, int] = problem.get_goal_loc()
-    initial_state_node: SearchTreeNode = SearchTreeNode(initial_state_loc, "", None)
-
-    frontier.put(initial_state_node)
-
-    while not frontier.empty():
-        expanded_node: SearchTreeNode = frontier.get()
-        transitions: dict[Any, Any] = problem.get_transitions(expanded_node.player_loc)
-        generated_children: List[SearchTreeNode] = []
 
-        for key in transitions:
-            generated_children.append(SearchTreeNode(transitions[key], key, expanded_node))
-        
-        for generated_child in generated_children:
-            if generated_child.player_loc == goal_state_loc:
-                return _trace_path(generated_child)
-            frontier.put(generated_child)
+    # per-location transition cache: revisited locations reuse the prebuilt
+    # (action, next_loc, packed next_loc) triples instead of re-running the dict
+    # construction and wall checks inside MazeProblem.get_transitions
+    @lru_cache(maxsize=None)
+    def _transitions_from(loc: tuple[int, int]) -> tuple[tuple[str, tuple[int, int], int], ...]:
+        return tuple((action, next_loc, _pack_loc(next_loc))
+                     for action, next_loc in problem.get_transitions(loc).items())
+
+    # the search runs breadth-first from BOTH ends at once: with one goal and
+    # symmetric moves, two frontiers of depth d/2 expand ~2*b^(d/2) nodes versus
+    # b^d for a single frontier. Each side records the node that first reached a
+    # cell (keyed by packed ints, which hash in a single op) so the two half
+    # paths can be stitched together where the searches meet.
+    fwd_reached: dict[int, SearchTreeNode] = {_pack_loc(initial_state_loc): SearchTreeNode(initial_state_loc, "", None)}
+    bwd_reached: dict[int, SearchTreeNode] = {_pack_loc(goal_state_loc): SearchTreeNode(goal_state_loc, "", None)}
+    fwd_frontier: list[SearchTreeNode] = list(fwd_reached.values())
+    bwd_frontier: list[SearchTreeNode] = list(bwd_reached.values())
+
+    while fwd_frontier and bwd_frontier:
+        # always sweep the smaller side's whole level, keeping both trees shallow
+        expanding_forward: bool = len(fwd_frontier) <= len(bwd_frontier)
+        frontier: list[SearchTreeNode] = fwd_frontier if expanding_forward else bwd_frontier
+        reached: dict[int, SearchTreeNode] = fwd_reached if expanding_forward else bwd_reached
+        other_reached: dict[int, SearchTreeNode] = bwd_reached if expanding_forward else fwd_reached
+
+        next_frontier: list[SearchTreeNode] = []
+        for expanded_node in frontier:
+            for key, next_loc, next_packed in _transitions_from(expanded_node.player_loc):
+                if next_packed in reached:
+                    continue
+                generated_child: SearchTreeNode = SearchTreeNode(next_loc, key, expanded_node)
+                reached[next_packed] = generated_child
+                # the other search already touched this cell: the two half
+                # paths join here
+                if next_packed in other_reached:
+                    if expanding_forward:
+                        return _stitch_paths(generated_child, other_reached[next_packed])
+                    return _stitch_paths(other_reached[next_packed], generated_child)
+                next_frontier.append(generated_child)
+
+        if expanding_forward:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
 
     return None
 
-def _trace_path(node: SearchTreeNode) -> Optional[list[str]]:
+def _stitch_paths(fwd_node: SearchTreeNode, bwd_node: SearchTreeNode) -> Optional[list[str]]:
     """
-    The method that finds the path taken to reach the given node from the initial state node using 
-    breadth first search.
+    Joins the two halves of a bidirectional search at their shared meeting cell:
+    the forward node's chain is replayed start-to-meeting, then the backward
+    node's chain is walked meeting-to-goal with each action inverted (its steps
+    were taken outward from the goal).
 
     Parameters:
-        node (SearchTreeNode):
-            The search tree node whose path is to be found.
+        fwd_node (SearchTreeNode):
+            The forward search's node at the meeting cell.
+        bwd_node (SearchTreeNode):
+            The backward search's node at that same cell.
 
     Returns:
         Optional[list[str]]:
-            A sequence of actions leading from the initial state node to given node. If given node 
-            is initial state, returns None.
+            The full sequence of actions from the initial state to the goal. If
+            the path is empty (initial state is the goal), returns None.
     """
 
+    # appending then reversing is O(n) overall, versus O(n^2) for insert(0, ...)
     actions: List[str] = []
+    node: SearchTreeNode = fwd_node
     while node.parent is not None:
-        actions.insert(0, node.action)
+        actions.append(node.action)
         node = node.parent
-    if(actions == []):
+    actions.reverse()
+
+    node = bwd_node
+    while node.parent is not None:
+        actions.append(_OPPOSITE_MOVES[node.action])
+        node = node.parent
+
+    if not actions:
         return None
     return actions
@@ -5,39 +5,36 @@ Author: Milo Fritzen
 Modify only this file as part of your submission, as it will contain all of the logic
 necessary for implementing the A* pathfinder that solves the target practice problem.
 '''
-from queue import *
+import heapq
+import numpy as np
 from maze_problem import MazeProblem
-from dataclasses import *
-from typing import *
-from queue import *
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+# numba is an optional accelerator: when present, pathfind dispatches to a
+# compiled kernel that runs the A* loop over flat numpy arrays; when absent,
+# the pure-Python search below is used unchanged
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE: bool = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# move actions in the fixed order the kernel indexes them; code 4 is the shot
+_KERNEL_ACTIONS: tuple[str, str, str, str, str] = ("U", "D", "L", "R", "S")
+# beyond this many (cell, target-subset) states the dense kernel arrays would
+# outgrow their memory advantage, so the Python search takes over
+_KERNEL_STATE_CAP: int = 1 << 22
+
+def _pack_loc(loc: tuple[int, int]) -> int:
+    '''
+    packs a (col, row) location tuple into a single int that hashes and compares in
+    one op; MazeProblem doesn't expose the maze width, so a fixed 16-bit shift is
+    used in place of row * width + col
+    '''
+    return (loc[0] << 16) | loc[1]
+
 
-@dataclass
-class SearchTreeNode:
-    """
-    SearchTreeNodes contain the following attributes to be used in generation of
-    the Search tree:
-
-    Attributes:
-        player_loc (tuple[int, int]):
-            The player's location in this node.
-        action (str):
-            The action taken to reach this node from its parent (or empty if the root).
-        parent (Optional[SearchTreeNode]):
-            The parent node from which this node was generated (or None if the root).
-    """
-    player_loc: tuple[int, int]
-    action: str
-    parent: Optional["SearchTreeNode"]
-    cost: int  # actual cost
-    guess: int  # heuristic guess
-    targets_left: set[tuple[int, int]]
-
-    def __str__(self) -> str:
-        return "@: " + str(self.player_loc)
-    
-    def __lt__(self, other: "SearchTreeNode") -> bool:
-        return (self.cost + self.guess) < (other.cost + other.guess)
-    
 def pathfind(problem: "MazeProblem") -> Optional[list[str]]:
     """
     The main workhorse method of the package that performs A* graph search to find the optimal
@@ -51,142 +48,338 @@ def pathfind(problem: "MazeProblem") -> Optional[list[str]]:
 
     Returns:
         Optional[list[str]]:
-            A solution to the problem: a sequence of actions leading from the 
+            A solution to the problem: a sequence of actions leading from the
             initial state to the goal (a maze with all targets destroyed). If no such solution is
             possible, returns None.
     """
-    
-    frontier: PriorityQueue[Tuple[int, SearchTreeNode]] = PriorityQueue()
-    # >> [NO] Data structure choice alert! We use the graveyard for previously expanded nodes/states, 
-    # requiring lots of membership tests -- a list will perform those in O(n) time whereas a set in O(1)! (-0.25)
-    graveyard: List = []
+    if _NUMBA_AVAILABLE:
+        return _pathfind_numba(problem)
+    return _pathfind_python(problem)
+
+def _pathfind_python(problem: "MazeProblem") -> Optional[list[str]]:
+    '''
+    Pure-Python A* graph search; the reference implementation used whenever the
+    compiled kernel is unavailable or the state space is too large for its
+    dense arrays.
+
+    Search bookkeeping lives in parallel per-node lists indexed by a node id
+    rather than heap-allocated node objects: appending four scalars per
+    generated state is cheaper than an object allocation, and tracing the
+    solution path walks contiguous lists instead of chasing parent pointers.
+    '''
+    # a plain list managed by heapq: same ordering as queue.PriorityQueue without
+    # the lock acquired on every put/get. Entries are (f, node id) tuples: ids
+    # are handed out monotonically, so they double as the tiebreak counter that
+    # settles equal-f comparisons at the C level in insertion order
+    frontier: list[tuple[int, int]] = []
+    # local bindings for the hot callables: locals resolve in one indexed load
+    # where module attributes cost a global dict probe per call in the loop
+    _heappush: Callable = heapq.heappush
+    _heappop: Callable = heapq.heappop
+    _heuristic: Callable = _calculate_heurisitc
+    # best known path cost per (player_loc, targets_left bitmask) state: a child
+    # is only pushed when it strictly beats this, which prunes both re-expansions
+    # (the old graveyard's job) and worse-cost duplicates already in the frontier
+    best_g: dict[tuple[int, int], int] = {}
     initial_state_loc: tuple[int, int] = problem.get_initial_loc()
-    targets: set[tuple[int,int]] = problem.get_initial_targets()
+    # each target owns one bit in a fixed ordering, so a state's remaining
+    # targets collapse to a single int whose set-difference is one AND
+    targets_tuple: tuple[tuple[int, int], ...] = tuple(sorted(problem.get_initial_targets()))
+    target_bits: dict[tuple[int, int], int] = {target: 1 << bit for bit, target in enumerate(targets_tuple)}
+    full_mask: int = (1 << len(targets_tuple)) - 1
+
+    # the MazeProblem API still speaks in target-location sets, so each unique
+    # mask is expanded back to a set at most once (get_transitions only reads
+    # the set, so handing out the cached instance is safe)
+    @lru_cache(maxsize=None)
+    def _mask_to_targets(mask: int) -> set[tuple[int, int]]:
+        return {target for target, bit in target_bits.items() if mask & bit}
 
-    initial_state_node: SearchTreeNode = SearchTreeNode(initial_state_loc, "", None, 0, _calculate_heurisitc(initial_state_loc, targets), targets)
-    # >> [NO] Remove commented out code from submission (-0.25)
-    # print("\n\n", initial_state_node, initial_state_node.action, initial_state_node.parent, initial_state_node.cost, initial_state_node.guess)
+    # the parallel node arrays, seeded with the root at id 0
+    node_parent: list[int] = [-1]
+    node_action: list[str] = [""]
+    node_loc: list[tuple[int, int]] = [initial_state_loc]
+    node_cost: list[int] = [0]
+    node_mask: list[int] = [full_mask]
 
     # adds the root to the frontier so we can start search
-    # >> [NO] OK, but custom class objects like SearchTreeNodes can be stored directly inside of
-    # a PriorityQueue as long as their __lt__ method is overridden, just like in CW1. Using the
-    # tuple method (priority, item) isn't functionally wrong, but stylistically more verbose than
-    # needed here.
-    frontier.put(((initial_state_node.guess), initial_state_node))
-
-    while not frontier.empty():
-        # temp var to help extract the next node from the priotity queue
-        top_of_queue: tuple[int, SearchTreeNode] = frontier.get()
-        expanded_node: SearchTreeNode = top_of_queue[1]
-
-        # checks goal state at generation
-        # print(expanded_node.targets_left == set())
-        if expanded_node.targets_left == set():
-            return _trace_path(expanded_node)
-
-        # adds the expanded node to the graveyard
-        graveyard.append(expanded_node)
-        
-        generated_children: List[SearchTreeNode] = []
-        transitions: dict = problem.get_transitions(expanded_node.player_loc, expanded_node.targets_left)
-
-        # for each possible action, find what the new node will be and add it to our children list
+    best_g[(_pack_loc(initial_state_loc), full_mask)] = 0
+    _heappush(frontier, (_heuristic(_pack_loc(initial_state_loc), full_mask, targets_tuple), 0))
+
+    while frontier:
+        node_id: int = _heappop(frontier)[1]
+        mask: int = node_mask[node_id]
+
+        # checks goal state: an empty remaining-target mask means every target is
+        # hit, and the action path is recovered by walking the parent ids back
+        if mask == 0:
+            actions: List[str] = []
+            while node_parent[node_id] >= 0:
+                actions.append(node_action[node_id])
+                node_id = node_parent[node_id]
+            actions.reverse()
+            return actions
+
+        cost: int = node_cost[node_id]
+        transitions: dict = problem.get_transitions(node_loc[node_id], _mask_to_targets(mask))
+
+        # for each possible action, record and frontier the child in a single
+        # pass -- only children that strictly improve on the best known cost to
+        # their state get recorded at all, everything else is a dominated duplicate
         for action in transitions:
             next_loc: tuple[int,int] = transitions[action]["next_loc"]
-            next_cost: int = transitions[action]["cost"] + expanded_node.cost  # cost of moving plus past cost
-            next_targets: set[tuple[int,int]] = expanded_node.targets_left.difference(transitions[action]["targets_hit"])
-            next_guess: int = _calculate_heurisitc(next_loc, next_targets)
-            # print("\n\n", next_guess, next_targets, "\n\n")
-            generated_children.append(SearchTreeNode(next_loc, action, expanded_node, next_cost, next_guess, next_targets))
-
-        # check if any of the children are in the graveyard before adding them to the frontier
-        for generated_child in generated_children:
-            # check graveyard before adding new nodes to the frontier
-            add_node: bool = True
-            for node in graveyard:
-                if _is_equal(node, generated_child):
-                    add_node = False
-            # if not in graveyard
-            if add_node:
-                frontier.put(((generated_child.cost + generated_child.guess), generated_child))
-        # print("\n", frontier.qsize())
+            next_cost: int = transitions[action]["cost"] + cost  # cost of moving plus past cost
+            next_targets: int = mask
+            for hit in transitions[action]["targets_hit"]:
+                next_targets &= ~target_bits[hit]
+            packed_loc: int = _pack_loc(next_loc)
+            child_key: tuple[int, int] = (packed_loc, next_targets)
+            if next_cost >= best_g.get(child_key, float("inf")):
+                continue
+            best_g[child_key] = next_cost
+            child_id: int = len(node_parent)
+            node_parent.append(node_id)
+            node_action.append(action)
+            node_loc.append(next_loc)
+            node_cost.append(next_cost)
+            node_mask.append(next_targets)
+            _heappush(frontier, (next_cost + _heuristic(packed_loc, next_targets, targets_tuple), child_id))
 
     # if a solution is not found in the search then we return None to represent no solution
     return None
 
-def _calculate_heurisitc(location: tuple[int, int], targets_left: set[tuple[int,int]]) -> int:
+def _pathfind_numba(problem: "MazeProblem") -> Optional[list[str]]:
     '''
-    adds cost of shooting once to the cost of moving into line with the nearest target to give an
-    admissable heuristic
+    Thin wrapper around the compiled A* kernel: discovers the maze's walkable
+    cells through MazeProblem's public transition API (the grid itself is
+    private), flattens them into numpy arrays with the remaining targets as a
+    bitmask, and decodes the kernel's action codes back into action strings.
     '''
-    make_guess: int = 0
-    # if there are no targets left the heuristic is returned while still at zero
-    if len(targets_left) == 0:
-        return make_guess
-    else:  # cost to shoot (at least one) target
-        make_guess += 2
-
-    # shortest distance to a line with a target in it
-    lines: dict = _get_heurisitc_lines(targets_left)
-    nearest: int
-    for i in range(len(lines["rows"])):
-        man_dist: int = abs(location[0] - lines["rows"][i])
-        if i == 0:
-            nearest = man_dist
-        elif man_dist < nearest:
-            nearest = man_dist
-    for i in range(len(lines["cols"])):
-        man_dist = abs(location[0] - lines["cols"][i])
-        if man_dist < nearest:
-            nearest = man_dist
-    make_guess += nearest
+    start_loc: tuple[int, int] = problem.get_initial_loc()
+    targets: list[tuple[int, int]] = sorted(problem.get_initial_targets())
+    no_targets: set[tuple[int, int]] = set()
 
-    return make_guess
+    # flood-fill the walkable cells reachable from the start; with no targets
+    # remaining, get_transitions excludes only walls
+    cell_ids: dict[tuple[int, int], int] = {start_loc: 0}
+    worklist: list[tuple[int, int]] = [start_loc]
+    while worklist:
+        loc = worklist.pop()
+        for transition in problem.get_transitions(loc, no_targets).values():
+            next_loc = transition["next_loc"]
+            if next_loc not in cell_ids:
+                cell_ids[next_loc] = len(cell_ids)
+                worklist.append(next_loc)
 
-def _get_heurisitc_lines(targets_left: set[tuple[int,int]]) -> dict[str,List[int]]:
-    '''
-    finds all the rows and colomns in line with targets
-    '''
-    lines: dict = {
-        "rows": [],
-        "cols": []
-    }
-    for positions in targets_left:
-        lines["rows"].append(positions[0])
-        lines["cols"].append(positions[1])
+    n_cells: int = len(cell_ids)
+    n_targets: int = len(targets)
+    # the dense per-(cell, target-subset) arrays only pay off while they fit
+    # comfortably in memory; otherwise the Python search takes over
+    if n_targets > 20 or n_cells << n_targets > _KERNEL_STATE_CAP:
+        return _pathfind_python(problem)
 
-    return lines
+    target_bits: dict[tuple[int, int], int] = {target: bit for bit, target in enumerate(targets)}
+    all_targets: set[tuple[int, int]] = set(targets)
 
-def _trace_path(node: SearchTreeNode) -> Optional[list[str]]:
-    '''
-    The method that finds the path taken (including shooting) to reach the given node from the initial state node using 
-    A* search.
+    neighbors: np.ndarray = np.full((n_cells, 4), -1, dtype=np.int32)
+    enter_cost: np.ndarray = np.ones(n_cells, dtype=np.int64)
+    shoot_masks: np.ndarray = np.zeros(n_cells, dtype=np.int64)
+    target_bit: np.ndarray = np.full(n_cells, -1, dtype=np.int32)
+    cell_cols: np.ndarray = np.empty(n_cells, dtype=np.int64)
+    cell_rows: np.ndarray = np.empty(n_cells, dtype=np.int64)
+    target_cols: np.ndarray = np.empty(n_targets, dtype=np.int64)
+    target_rows: np.ndarray = np.empty(n_targets, dtype=np.int64)
 
-    Parameters:
-        node (SearchTreeNode):
-            The search tree node whose path is to be found.
+    for target, bit in target_bits.items():
+        target_cols[bit] = target[0]
+        target_rows[bit] = target[1]
 
-    Returns:
-        Optional[list[str]]:
-            A sequence of actions leading from the initial state node to given node. If given node 
-            is initial state, returns None.
-    '''
+    for loc, cell in cell_ids.items():
+        cell_cols[cell] = loc[0]
+        cell_rows[cell] = loc[1]
+        # get_transition_cost folds in the mud check for any move action
+        enter_cost[cell] = problem.get_transition_cost("U", loc)
+        if loc in target_bits:
+            target_bit[cell] = target_bits[loc]
+        for hit in problem.get_visible_targets_from_loc(loc, all_targets):
+            shoot_masks[cell] |= 1 << target_bits[hit]
+        for action, transition in problem.get_transitions(loc, no_targets).items():
+            if action != "S":
+                neighbors[cell, _KERNEL_ACTIONS.index(action)] = cell_ids[transition["next_loc"]]
+
+    codes: np.ndarray = _astar_nb(neighbors, enter_cost, shoot_masks, target_bit,
+                                  cell_cols, cell_rows, target_cols, target_rows,
+                                  cell_ids[start_loc])
+    if codes.shape[0] == 1 and codes[0] < 0:
+        return None
+    return [_KERNEL_ACTIONS[code] for code in codes]
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _h_nb(col: int, row: int, mask: int, target_cols: np.ndarray, target_rows: np.ndarray) -> int:
+        '''
+        compiled twin of _calculate_heurisitc: shot cost plus the distance to the
+        nearest row or col line holding a remaining (mask-set) target
+        '''
+        if mask == 0:
+            return 0
+        nearest = 1 << 30
+        for bit in range(target_cols.shape[0]):
+            if mask & (1 << bit):
+                col_dist = abs(col - target_cols[bit])
+                row_dist = abs(row - target_rows[bit])
+                if col_dist < nearest:
+                    nearest = col_dist
+                if row_dist < nearest:
+                    nearest = row_dist
+        return nearest + 2
+
+    @njit(cache=True)
+    def _astar_nb(neighbors: np.ndarray, enter_cost: np.ndarray, shoot_masks: np.ndarray,
+                  target_bit: np.ndarray, cell_cols: np.ndarray, cell_rows: np.ndarray,
+                  target_cols: np.ndarray, target_rows: np.ndarray,
+                  start_cell: int) -> np.ndarray:
+        '''
+        A* over (cell, targets-remaining-bitmask) states run entirely on flat
+        arrays: g-scores and parents are dense per-state vectors and the frontier
+        is a manual binary heap of f * n_states + state entries.
+
+        Returns the action codes of an optimal plan, an empty array when the start
+        is already a goal, or the single code -1 when no solution exists.
+        '''
+        n_cells = neighbors.shape[0]
+        n_targets = target_cols.shape[0]
+        n_masks = 1 << n_targets
+        n_states = n_cells * n_masks
+        full_mask = n_masks - 1
+
+        INF = np.int64(1) << 60
+        g_score = np.full(n_states, INF, dtype=np.int64)
+        parent = np.full(n_states, -1, dtype=np.int64)
+        parent_act = np.full(n_states, -1, dtype=np.int8)
+
+        heap = np.empty(1024, dtype=np.int64)
+        start_state = start_cell * n_masks + full_mask
+        g_score[start_state] = 0
+        start_h = _h_nb(cell_cols[start_cell], cell_rows[start_cell], full_mask,
+                        target_cols, target_rows)
+        heap[0] = np.int64(start_h) * n_states + start_state
+        heap_size = 1
 
-    actions: List[str] = []
-    while node.parent is not None:
-        actions.insert(0, node.action)
-        node = node.parent
-    return actions
+        while heap_size > 0:
+            # pop the min-f entry and restore the heap property by sifting down
+            entry = heap[0]
+            heap_size -= 1
+            heap[0] = heap[heap_size]
+            hole = 0
+            while True:
+                left = 2 * hole + 1
+                if left >= heap_size:
+                    break
+                right = left + 1
+                smallest = left
+                if right < heap_size and heap[right] < heap[left]:
+                    smallest = right
+                if heap[hole] <= heap[smallest]:
+                    break
+                swap = heap[hole]
+                heap[hole] = heap[smallest]
+                heap[smallest] = swap
+                hole = smallest
 
-def _is_equal(node: SearchTreeNode, other: SearchTreeNode) -> bool:
+            state = entry % n_states
+            cell = state // n_masks
+            mask = state % n_masks
+            cost = entry // n_states - _h_nb(cell_cols[cell], cell_rows[cell], mask,
+                                             target_cols, target_rows)
+            if cost > g_score[state]:
+                continue  # stale heap entry superseded by a cheaper path
+
+            if mask == 0:
+                # goal reached: walk the parent chain and emit codes in order
+                length = 0
+                back = state
+                while parent[back] >= 0:
+                    length += 1
+                    back = parent[back]
+                codes = np.empty(length, dtype=np.int8)
+                back = state
+                spot = length - 1
+                while parent[back] >= 0:
+                    codes[spot] = parent_act[back]
+                    spot -= 1
+                    back = parent[back]
+                return codes
+
+            for action in range(5):
+                if action < 4:
+                    next_cell = neighbors[cell, action]
+                    if next_cell < 0:
+                        continue
+                    # a still-standing target blocks movement onto its tile
+                    bit = target_bit[next_cell]
+                    if bit >= 0 and (mask >> bit) & 1:
+                        continue
+                    next_mask = mask
+                    next_cost = cost + enter_cost[next_cell]
+                else:
+                    next_cell = cell
+                    next_mask = mask & ~shoot_masks[cell]
+                    next_cost = cost + 2
+
+                next_state = next_cell * n_masks + next_mask
+                if next_cost >= g_score[next_state]:
+                    continue
+                g_score[next_state] = next_cost
+                parent[next_state] = state
+                parent_act[next_state] = action
+
+                if heap_size == heap.shape[0]:
+                    grown = np.empty(heap.shape[0] * 2, dtype=np.int64)
+                    grown[:heap_size] = heap
+                    heap = grown
+                next_f = next_cost + _h_nb(cell_cols[next_cell], cell_rows[next_cell],
+                                           next_mask, target_cols, target_rows)
+                # push and sift up
+                heap[heap_size] = np.int64(next_f) * n_states + next_state
+                hole = heap_size
+                heap_size += 1
+                while hole > 0:
+                    above = (hole - 1) >> 1
+                    if heap[above] <= heap[hole]:
+                        break
+                    swap = heap[above]
+                    heap[above] = heap[hole]
+                    heap[hole] = swap
+                    hole = above
+
+        return np.full(1, -1, dtype=np.int8)
+
+@lru_cache(maxsize=None)
+def _calculate_heurisitc(packed_loc: int, targets_mask: int, targets: tuple) -> int:
     '''
-    If the location and remaining targets of two nodes are the same, we can assume that lowest
-    cost path got us there first so we can ignore repeated states
+    adds cost of shooting once to the cost of moving into line with the nearest target to give an
+    admissable heuristic; memoized since many generated nodes share a (location, targets) pair
     '''
-    if node.player_loc == other.player_loc and node.targets_left == other.targets_left:
-        return True
+    # if there are no targets left the heuristic is zero
+    if targets_mask == 0:
+        return 0
+    # cost to shoot (at least one) target
+    make_guess: int = 2
 
-    return False
+    # shortest distance to a line with a remaining target in it, visiting only the
+    # set bits of the mask (the 4-connected grid has no diagonal moves, so the
+    # tightest admissible move estimate is this Manhattan distance to a line)
+    col, row = packed_loc >> 16, packed_loc & 0xFFFF
+    nearest: int = 1 << 30
+    mask: int = targets_mask
+    while mask:
+        target = targets[(mask & -mask).bit_length() - 1]
+        nearest = min(nearest, abs(col - target[0]), abs(row - target[1]))
+        mask &= mask - 1
+    make_guess += nearest
+
+    return make_guess
 
 # ===================================================
 # >>> [NO] Summary
@@ -2,10 +2,72 @@
 Artificial Intelligence responsible for playing the game of T3!
 Implements the alpha-beta-pruning mini-max search algorithm
 """
+import random
 from dataclasses import *
 from typing import *
 from t3_state import *
-    
+
+# the compiled bitboard search is optional: without numba installed the pure
+# Python minimax below handles every board
+try:
+    from t3_state_fast import pack_board, minimax_fast
+    _NUMBA_AVAILABLE: bool = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# transposition table flags: whether a cached value is exact, or only a
+# lower / upper bound because an alpha-beta window clipped that subtree
+EXACT: str = "EX"
+LOWER_BOUND: str = "LB"
+UPPER_BOUND: str = "UB"
+
+# Zobrist hashing for the search tables: one random 64-bit key per (cell, value)
+# pair plus a whose-turn key, XORed together to identify a board. Each child's
+# key is its parent's XOR two keys, so hashing costs O(1) per node instead of
+# T3State.__hash__'s per-probe str(self._state) rebuild. The fixed seed keeps
+# keys identical across runs; per-cell key rows are grown on demand so boards
+# larger than 3x3 work too
+_ZOBRIST_RNG: random.Random = random.Random(0x7E57)
+_ZOBRIST_TURN_KEY: int = _ZOBRIST_RNG.getrandbits(64)
+_zobrist_keys: list[list[int]] = []
+
+def _zobrist_hash(state: "T3State") -> int:
+    """
+    Computes a state's Zobrist key with a full board scan, growing the per-cell
+    key table to cover the board if needed. Only the root of a search pays this
+    scan; every child key is derived incrementally in _child_key.
+    """
+    cells: int = state._rows * state._cols
+    while len(_zobrist_keys) < cells:
+        _zobrist_keys.append([_ZOBRIST_RNG.getrandbits(64) for _ in range(T3State.MAX_MOVE + 1)])
+    key: int = _ZOBRIST_TURN_KEY if state._odd_turn else 0
+    for row in range(state._rows):
+        for col in range(state._cols):
+            value: int = state._state[row][col]
+            if value:
+                key ^= _zobrist_keys[row * state._cols + col][value]
+    return key
+
+def _child_key(parent_key: int, state: "T3State", action: "T3Action") -> int:
+    """
+    Derives a child state's Zobrist key from its parent's: XOR in the key of
+    the (cell, value) the action fills, and flip the whose-turn key.
+    """
+    cell: int = action._row * state._cols + action._col
+    return parent_key ^ _zobrist_keys[cell][action._move] ^ _ZOBRIST_TURN_KEY
+
+# maps Zobrist keys to (state, utility, relative depth of terminal, action, flag)
+# so boards reached through different move orders are searched only once; the
+# state is stored in the entry and compared on probe, so a (vanishingly rare)
+# 64-bit key collision is detected rather than silently corrupting the search.
+# Cleared per choose call since utilities are from the current agent's perspective
+_transposition_table: dict[int, tuple["T3State", float, float, Optional["T3Action"], str]] = {}
+
+# remembers the best action found at each state by earlier (shallower) deepening
+# passes; trying it first in later passes triggers alpha-beta cutoffs sooner.
+# A key collision here only perturbs move ordering, so entries go unverified
+_best_move_table: dict[int, Optional["T3Action"]] = {}
+
 def choose(state: "T3State") -> Optional["T3Action"]:
     """
     Main workhorse of the T3Player that makes the optimal decision from the max node
@@ -33,18 +95,100 @@ def choose(state: "T3State") -> Optional["T3Action"]:
             Otherwise, returns the best T3Action the current player could take
             from the given state by the criteria stated above.
     """
-    # if a move needs to be made, find the best move to make using minimax with alpha-beta-pruning
+    # standard 3x3 boards run entirely inside the compiled bitboard kernel,
+    # which mirrors this file's search decision-for-decision; anything else
+    # (or a missing numba install) takes the Python path below
+    if _NUMBA_AVAILABLE and state._rows == 3 and state._cols == 3:
+        packed_result: int = minimax_fast(pack_board(state._state), int(state._odd_turn),
+                                          len(state.get_open_tiles()))
+        action_index: int = (packed_result >> 8) & 0xFF
+        if action_index == 255:  # terminal root: no action to take
+            return None
+        # the kernel's action index packs cell * 8 + move with cell = col * 3 + row
+        cell: int = action_index >> 3
+        return T3Action(cell // 3, cell % 3, action_index & 0x7)
+
+    # if a move needs to be made, find the best move to make using minimax with alpha-beta-pruning.
+    # Iterative deepening runs cheap bounded searches first purely to seed the
+    # best-move table, so the final full-depth search expands its strongest
+    # children first and prunes far more aggressively
+    _best_move_table.clear()
+    remaining_moves: int = len(state.get_open_tiles())
+    for max_depth in range(1, remaining_moves):
+        _transposition_table.clear()
+        minimax(state, -float("inf"), float("inf"), True, 0, max_depth)
+
+    _transposition_table.clear()
     best_move: "DataClass" = minimax(state, -float("inf"), float("inf"), True, 0)
     return best_move.action
 
-def minimax(state: "T3State", alpha: float, beta: float, isMaxNode: bool, depth: float) -> "DataClass":
-    children = state.get_transitions()  # set of "child" nodes
-    temp: "DataClass"
-    # ininital best_move_data and next_move with awful stats so it gets replaced by ANY other move
-    best_move_data: "DataClass" = DataClass(-float("inf"), float("inf"), None)
-    worst_move_data: "DataClass" = DataClass(float("inf"), float("inf"), None)
-    next_move_data: "DataClass"
+def minimax(state: "T3State", alpha: float, beta: float, isMaxNode: bool, depth: float, depth_limit: Optional[float] = None) -> "DataClass":
+    """
+    Alpha-beta minimax run as an explicit stack loop rather than recursion:
+    every node that used to be a Python call frame is a mutable _Frame object,
+    so the search pays list pushes and pops instead of per-node function call
+    setup and teardown, which dominates the cost of this workload.
+    """
+    # only the root's key needs a board scan; children derive theirs by XOR
+    key: int = _zobrist_hash(state)
+
+    # leaves (terminals, depth-limit stops, transposition hits) never need a frame
+    leaf: Optional["DataClass"] = _leaf_result(state, key, alpha, beta, isMaxNode, depth, depth_limit)
+    if leaf is not None:
+        return leaf
+
+    stack: list["_Frame"] = [_make_frame(state, key, alpha, beta, isMaxNode, depth, None)]
+    while True:
+        frame: "_Frame" = stack[-1]
+
+        # a finished frame is one whose window closed (cutoff) or whose children
+        # are exhausted; its best result propagates into its parent
+        next_child = None if frame.alpha >= frame.beta else next(frame.children, None)
+        if next_child is None:
+            _store_in_table(frame.state, frame.key, frame.best_move_data, frame.depth, frame.alpha_original, frame.beta_original)
+            stack.pop()
+            if not stack:
+                return frame.best_move_data
+            # only the root has no via_action, and it returned just above
+            assert frame.via_action is not None
+            _absorb_child_result(stack[-1], frame.via_action, frame.best_move_data)
+            continue
+
+        action, child_state = next_child
+        child_key: int = _child_key(frame.key, frame.state, action)
+        leaf = _leaf_result(child_state, child_key, frame.alpha, frame.beta, not frame.isMaxNode, frame.depth + 1, depth_limit)
+        if leaf is not None:
+            _absorb_child_result(frame, action, leaf)
+        else:
+            child_frame: "_Frame" = _make_frame(child_state, child_key, frame.alpha, frame.beta, not frame.isMaxNode, frame.depth + 1, action)
+            stack.append(child_frame)
+
+def _leaf_result(state: "T3State", key: int, alpha: float, beta: float, isMaxNode: bool, depth: float, depth_limit: Optional[float]) -> Optional["DataClass"]:
+    """
+    Resolves a node without expanding it if possible, returning None when a
+    full expansion is required.
+
+    Parameters:
+        state (T3State):
+            The node's board state.
+        key (int):
+            The state's Zobrist key, used to probe the transposition table.
+        alpha (float):
+            The inherited alpha bound, used to validate transposition entries.
+        beta (float):
+            The inherited beta bound, used to validate transposition entries.
+        isMaxNode (bool):
+            Whether it is the agent's turn at this node.
+        depth (float):
+            The node's depth below the root.
+        depth_limit (Optional[float]):
+            The bounded deepening pass's horizon, or None for the full search.
 
+    Returns:
+        Optional[DataClass]:
+            The node's result if it is terminal, beyond the depth limit, or a
+            usable transposition hit; None otherwise.
+    """
     # check base cases and return data class with appropriate values (the action is None in case no move is needed)
     if state.is_tie():  # if we tie util is 0
         return DataClass(0, depth, None)
@@ -53,81 +197,115 @@ def minimax(state: "T3State", alpha: float, beta: float, isMaxNode: bool, depth:
     elif (state.is_win() and not isMaxNode):  # agent wins if the terminal node is a min, util = 1
         return DataClass(1, depth, None)
 
-    # if not terminal, take utility of "child" nodes
-    # the agent moves at max nodes
-    if (isMaxNode):
-        for next_move in children:
-            temp = minimax(next_move[1], alpha, beta, False, depth + 1)
-            alpha = max(alpha, temp.utility)
-            next_move_data = DataClass(temp.utility, temp.depth, next_move[0])
-
-            # if our next move is better then track that instead (max node)
-            if best_move_data.is_next_better(next_move_data):
-                best_move_data = next_move_data
-
-            if (alpha >= beta):
-                break
-        
-        return best_move_data
-    
-    # min nodes represent the player's turn
+    # bounded deepening passes stop here and call the unresolved state neutral;
+    # only the final unbounded pass decides the move actually played
+    if depth_limit is not None and depth >= depth_limit:
+        return DataClass(0, depth, None)
+
+    # probe the transposition table: the same board can be reached through many
+    # move orders, and a cached result spares us re-searching its whole subtree.
+    # Terminal depths are cached relative to the node so they can be re-anchored
+    # at whatever depth the transposition appears; the stored state must match
+    # ours exactly, or the hit is a key collision and gets ignored
+    cached = _transposition_table.get(key)
+    if cached is not None and cached[0] == state:
+        _, cached_utility, cached_rel_depth, cached_action, cached_flag = cached
+        if cached_flag == EXACT or \
+           (cached_flag == LOWER_BOUND and cached_utility >= beta) or \
+           (cached_flag == UPPER_BOUND and cached_utility <= alpha):
+            return DataClass(cached_utility, depth + cached_rel_depth, cached_action)
+
+    return None
+
+def _make_frame(state: "T3State", key: int, alpha: float, beta: float, isMaxNode: bool, depth: float, via_action: Optional["T3Action"]) -> "_Frame":
+    """
+    Builds the search frame for a node that needs full expansion, with its
+    children pre-sorted into promise order: the move a shallower deepening pass
+    liked best, then immediate wins, then the rest. The sort is stable, so
+    tiebreaking order is preserved within each rank.
+    """
+    previous_best: Optional["T3Action"] = _best_move_table.get(key)
+    children = iter(sorted(state.get_transitions(),
+                           key=lambda child: 0 if child[0] == previous_best else 1 if child[1].is_win() else 2))
+    return _Frame(state, key, alpha, beta, isMaxNode, depth, via_action, children,
+                  alpha, beta, DataClass(-float("inf"), float("inf"), None), (-float("inf"),) * 5)
+
+def _absorb_child_result(frame: "_Frame", action: "T3Action", result: "DataClass") -> None:
+    """
+    Folds one child's finished result into its parent frame, exactly as the
+    body of the old recursive loop did: tighten the window, then keep the
+    candidate if its sort key beats the current best. Candidates are ranked by
+    a single C-level tuple comparison: utility first (negated on min nodes so
+    the SMALLEST utility ranks highest), then -depth (shallower terminals win),
+    then the action's negated col/row/move so the LOWEST action wins ties.
+    """
+    if frame.isMaxNode:
+        if result.utility > frame.alpha:
+            frame.alpha = result.utility
+        candidate_key = (result.utility, -result.depth, -action._col, -action._row, -action._move)
+    else:
+        if result.utility < frame.beta:
+            frame.beta = result.utility
+        candidate_key = (-result.utility, -result.depth, -action._col, -action._row, -action._move)
+
+    if candidate_key > frame.best_key:
+        frame.best_key = candidate_key
+        frame.best_move_data = DataClass(result.utility, result.depth, action)
+
+@dataclass
+class _Frame:
+    """
+    One in-progress minimax node on the manual search stack, carrying exactly
+    the locals the recursive version kept in its call frame.
+    """
+    state: "T3State"
+    key: int
+    alpha: float
+    beta: float
+    isMaxNode: bool
+    depth: float
+    # the action the PARENT took to generate this node, used when propagating
+    # this node's result back up (None for the root)
+    via_action: Optional["T3Action"]
+    children: Iterator[tuple["T3Action", "T3State"]]
+    # the window the node started with, kept to flag its transposition entry
+    alpha_original: float
+    beta_original: float
+    best_move_data: "DataClass"
+    best_key: tuple
+
+def _store_in_table(state: "T3State", key: int, result: "DataClass", depth: float, alpha_original: float, beta_original: float) -> None:
+    """
+    Records a finished node's result in the transposition table, flagged by how
+    the original alpha-beta window constrained it: a value at or below the
+    original alpha is only an upper bound, one at or above the original beta
+    only a lower bound, and anything strictly inside the window is exact.
+
+    Parameters:
+        state (T3State):
+            The searched state, stored in the entry to verify probes against.
+        key (int):
+            The state's Zobrist key, used as the table key.
+        result (DataClass):
+            The utility / terminal depth / action returned for that state.
+        depth (float):
+            The node's depth, subtracted so the cached terminal depth is relative.
+        alpha_original (float):
+            The alpha bound the node was searched under, before its children raised it.
+        beta_original (float):
+            The beta bound the node was searched under, before its children lowered it.
+    """
+    if result.utility <= alpha_original:
+        flag = UPPER_BOUND
+    elif result.utility >= beta_original:
+        flag = LOWER_BOUND
     else:
-        for next_move in children:
-            temp = minimax(next_move[1], alpha, beta, True, depth + 1)
-            beta = min(beta, temp.utility)
-            next_move_data = DataClass(temp.utility, temp.depth, next_move[0])
-
-            # if our next worse is better then track that instead (min node)
-            if worst_move_data.is_next_worse(next_move_data):
-                    worst_move_data = next_move_data
-
-            if (alpha >= beta):
-                break
-        
-        return worst_move_data
+        flag = EXACT
+    _transposition_table[key] = (state, result.utility, result.depth - depth, result.action, flag)
+    _best_move_table[key] = result.action
     
 @dataclass
 class DataClass:
     utility: float
     depth: float
-    action: Optional["T3Action"]
-
-    def is_next_better(self, other: "DataClass") -> bool:
-        # if the other move has a better utility, then it is a better move
-        if other.utility > self.utility:
-            return True
-        
-        # we nesting loops to make sure things get checked in the right order
-        elif other.utility == self.utility:
-            # if the other move has a lower depth, it is better
-            if other.depth < self.depth:
-                return True
-            
-            # more nests
-            elif other.depth == self.depth:
-                # None checks are for edge cases where action has not been defined yet
-                if self.action is not None and other.action is not None:
-                    # finally check action tiebreaker criteria
-                    return other.action < self.action
-
-        return False
-    
-    def is_next_worse(self, other: "DataClass") -> bool:
-        # if the other move has a better utility, then it is a better move
-        if other.utility < self.utility:
-            return True
-        
-        # if the utility is the same we still want tie broken moves
-        elif other.utility == self.utility:
-            # if the other move has a lower depth, it is better
-            if other.depth < self.depth:
-                return True
-            
-            # more nests
-            elif other.depth == self.depth:
-                # None checks are for edge cases where action has not been defined yet
-                if self.action is not None and other.action is not None:
-                    # finally check action tiebreaker criteria
-                    return other.action < self.action
-
-        return False
\ No newline at end of file
+    action: Optional["T3Action"]
\ No newline at end of file
